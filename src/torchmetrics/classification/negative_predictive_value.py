@@ -11,18 +11,25 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import functools
 from collections.abc import Sequence
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, Union
 
+import torch
 from torch import Tensor
 from typing_extensions import Literal
 
 from torchmetrics.classification.base import _ClassificationTaskWrapper
 from torchmetrics.classification.stat_scores import BinaryStatScores, MulticlassStatScores, MultilabelStatScores
-from torchmetrics.functional.classification.negative_predictive_value import _negative_predictive_value_reduce
+from torchmetrics.functional.classification.negative_predictive_value import (
+    _compiled_negative_predictive_value_reduce,
+    _negative_predictive_value_reduce,
+)
 from torchmetrics.metric import Metric
-from torchmetrics.utilities.enums import ClassificationTask
-from torchmetrics.utilities.imports import _MATPLOTLIB_AVAILABLE
+from torchmetrics.utilities.compute import _safe_divide
+from torchmetrics.utilities.distributed import _all_reduce_sum, gather_all_tensors
+from torchmetrics.utilities.enums import ClassificationTask, _classification_task_from_str
+from torchmetrics.utilities.imports import _MATPLOTLIB_AVAILABLE, _TORCH_GREATER_EQUAL_2_1
 from torchmetrics.utilities.plot import _AX_TYPE, _PLOT_OUT_TYPE
 
 if not _MATPLOTLIB_AVAILABLE:
@@ -33,6 +40,58 @@ if not _MATPLOTLIB_AVAILABLE:
     ]
 
 
+def _check_compile_reduce(compile_reduce: bool) -> None:
+    """Validate the ``compile_reduce`` argument shared by the negative predictive value metrics."""
+    if not isinstance(compile_reduce, bool):
+        raise ValueError(f"Expected argument `compile_reduce` to be a `bool` but got {compile_reduce}")
+    if compile_reduce and not _TORCH_GREATER_EQUAL_2_1:
+        raise ValueError("Argument `compile_reduce=True` requires `torch>=2.1`.")
+
+
+def _disable_compile(fn: Callable) -> Callable:
+    """Exclude ``fn`` from ``torch.compile`` tracing, such that dynamo does not trace the matplotlib calls in it.
+
+    ``torch.compiler.disable`` imports dynamo when it is applied, so it is only applied on the first call of ``fn`` to
+    keep the import of torchmetrics cheap.
+
+    """
+    if not _TORCH_GREATER_EQUAL_2_1:
+        return fn
+    disabled_fn: Optional[Callable] = None
+
+    @functools.wraps(fn)
+    def wrapped(*args: Any, **kwargs: Any) -> Any:
+        nonlocal disabled_fn
+        if disabled_fn is None:
+            disabled_fn = torch.compiler.disable(fn)
+        return disabled_fn(*args, **kwargs)
+
+    return wrapped
+
+
+def _sync_stat_scores_by_all_reduce(
+    metric: Union[BinaryStatScores, MulticlassStatScores, MultilabelStatScores],
+    dist_sync_fn: Callable,
+    process_group: Optional[Any] = None,
+) -> bool:
+    """Sync the ``tp``, ``fp``, ``tn`` and ``fn`` states with a sum all-reduce instead of gathering them.
+
+    This is only possible when the states are sum-reduced tensors (``multidim_average="global"``) and the default
+    gather function is used, as a user provided ``dist_sync_fn`` is expected to return the values of all processes.
+    Returns ``True`` if the states were synced, ``False`` if the default syncing logic should be used.
+
+    """
+    if dist_sync_fn is not gather_all_tensors or metric.multidim_average != "global":
+        return False
+    states = {attr: getattr(metric, attr) for attr in ("tp", "fp", "tn", "fn")}
+    if not all(isinstance(state, Tensor) for state in states.values()):
+        return False
+    group = process_group or metric.process_group
+    for attr, state in states.items():
+        setattr(metric, attr, _all_reduce_sum(state, group=group))
+    return True
+
+
 class BinaryNegativePredictiveValue(BinaryStatScores):
     r"""Compute `Negative Predictive Value`_ for binary tasks.
 
@@ -71,6 +130,10 @@ class BinaryNegativePredictiveValue(BinaryStatScores):
             Specifies a target value that is ignored and does not contribute to the metric calculation
         validate_args: bool indicating if input arguments and tensors should be validated for correctness.
             Set to ``False`` for faster computations.
+        compile_reduce: bool indicating if the final reduction in ``compute`` should be compiled with
+            ``torch.compile``. Requires ``torch>=2.1``. The first call to ``compute`` will be slower as it triggers
+            the compilation.
+        kwargs: Additional keyword arguments, see :ref:`Metric kwargs` for more info.
 
     Example (preds is int tensor):
         >>> from torch import tensor
@@ -102,14 +165,39 @@ class BinaryNegativePredictiveValue(BinaryStatScores):
 
     plot_lower_bound: float = 0.0
     plot_upper_bound: float = 1.0
+    _samplewise_state_dtype: Optional[torch.dtype] = torch.int32
+
+    def __init__(
+        self,
+        threshold: float = 0.5,
+        multidim_average: Literal["global", "samplewise"] = "global",
+        ignore_index: Optional[int] = None,
+        validate_args: bool = True,
+        compile_reduce: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(threshold, multidim_average, ignore_index, validate_args, **kwargs)
+        if validate_args:
+            _check_compile_reduce(compile_reduce)
+        self.compile_reduce = compile_reduce
 
     def compute(self) -> Tensor:
         """Compute metric."""
+        if not self.compile_reduce:
+            # no averaging is needed for the binary case, so skip the generic reduction logic
+            _, _, tn, fn = self._final_state()
+            tn = tn if tn.is_floating_point() else tn.float()
+            return _safe_divide(tn, tn + fn)
         tp, fp, tn, fn = self._final_state()
-        return _negative_predictive_value_reduce(
-            tp, fp, tn, fn, average="binary", multidim_average=self.multidim_average
-        )
+        reduce_fn = _compiled_negative_predictive_value_reduce()
+        return reduce_fn(tp, fp, tn, fn, average="binary", multidim_average=self.multidim_average)
+
+    def _sync_dist(self, dist_sync_fn: Callable = gather_all_tensors, process_group: Optional[Any] = None) -> None:
+        """Sync the sum-reduced statistics with an all-reduce, falling back to the default gather based logic."""
+        if not _sync_stat_scores_by_all_reduce(self, dist_sync_fn, process_group):
+            super()._sync_dist(dist_sync_fn, process_group)
 
+    @_disable_compile
     def plot(
         self, val: Optional[Union[Tensor, Sequence[Tensor]]] = None, ax: Optional[_AX_TYPE] = None
     ) -> _PLOT_OUT_TYPE:
@@ -212,6 +300,10 @@ class MulticlassNegativePredictiveValue(MulticlassStatScores):
             Specifies a target value that is ignored and does not contribute to the metric calculation
         validate_args: bool indicating if input arguments and tensors should be validated for correctness.
             Set to ``False`` for faster computations.
+        compile_reduce: bool indicating if the final reduction in ``compute`` should be compiled with
+            ``torch.compile``. Requires ``torch>=2.1``. The first call to ``compute`` will be slower as it triggers
+            the compilation.
+        kwargs: Additional keyword arguments, see :ref:`Metric kwargs` for more info.
 
     Example (preds is int tensor):
         >>> from torch import tensor
@@ -256,14 +348,37 @@ class MulticlassNegativePredictiveValue(MulticlassStatScores):
     plot_lower_bound: float = 0.0
     plot_upper_bound: float = 1.0
     plot_legend_name: str = "Class"
+    _samplewise_state_dtype: Optional[torch.dtype] = torch.int32
+    _reduce = staticmethod(_negative_predictive_value_reduce)
+
+    def __init__(
+        self,
+        num_classes: Optional[int] = None,
+        top_k: int = 1,
+        average: Optional[Literal["micro", "macro", "weighted", "none"]] = "macro",
+        multidim_average: Literal["global", "samplewise"] = "global",
+        ignore_index: Optional[int] = None,
+        validate_args: bool = True,
+        compile_reduce: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(num_classes, top_k, average, multidim_average, ignore_index, validate_args, **kwargs)
+        if validate_args:
+            _check_compile_reduce(compile_reduce)
+        self.compile_reduce = compile_reduce
 
     def compute(self) -> Tensor:
         """Compute metric."""
         tp, fp, tn, fn = self._final_state()
-        return _negative_predictive_value_reduce(
-            tp, fp, tn, fn, average=self.average, multidim_average=self.multidim_average, top_k=self.top_k
-        )
+        reduce_fn = _compiled_negative_predictive_value_reduce() if self.compile_reduce else self._reduce
+        return reduce_fn(tp, fp, tn, fn, average=self.average, multidim_average=self.multidim_average, top_k=self.top_k)
+
+    def _sync_dist(self, dist_sync_fn: Callable = gather_all_tensors, process_group: Optional[Any] = None) -> None:
+        """Sync the sum-reduced statistics with an all-reduce, falling back to the default gather based logic."""
+        if not _sync_stat_scores_by_all_reduce(self, dist_sync_fn, process_group):
+            super()._sync_dist(dist_sync_fn, process_group)
 
+    @_disable_compile
     def plot(
         self, val: Optional[Union[Tensor, Sequence[Tensor]]] = None, ax: Optional[_AX_TYPE] = None
     ) -> _PLOT_OUT_TYPE:
@@ -363,6 +478,10 @@ class MultilabelNegativePredictiveValue(MultilabelStatScores):
             Specifies a target value that is ignored and does not contribute to the metric calculation
         validate_args: bool indicating if input arguments and tensors should be validated for correctness.
             Set to ``False`` for faster computations.
+        compile_reduce: bool indicating if the final reduction in ``compute`` should be compiled with
+            ``torch.compile``. Requires ``torch>=2.1``. The first call to ``compute`` will be slower as it triggers
+            the compilation.
+        kwargs: Additional keyword arguments, see :ref:`Metric kwargs` for more info.
 
     Example (preds is int tensor):
         >>> from torch import tensor
@@ -405,14 +524,37 @@ class MultilabelNegativePredictiveValue(MultilabelStatScores):
     plot_lower_bound: float = 0.0
     plot_upper_bound: float = 1.0
     plot_legend_name: str = "Label"
+    _samplewise_state_dtype: Optional[torch.dtype] = torch.int32
+    _reduce = staticmethod(_negative_predictive_value_reduce)
+
+    def __init__(
+        self,
+        num_labels: int,
+        threshold: float = 0.5,
+        average: Optional[Literal["micro", "macro", "weighted", "none"]] = "macro",
+        multidim_average: Literal["global", "samplewise"] = "global",
+        ignore_index: Optional[int] = None,
+        validate_args: bool = True,
+        compile_reduce: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(num_labels, threshold, average, multidim_average, ignore_index, validate_args, **kwargs)
+        if validate_args:
+            _check_compile_reduce(compile_reduce)
+        self.compile_reduce = compile_reduce
 
     def compute(self) -> Tensor:
         """Compute metric."""
         tp, fp, tn, fn = self._final_state()
-        return _negative_predictive_value_reduce(
-            tp, fp, tn, fn, average=self.average, multidim_average=self.multidim_average, multilabel=True
-        )
+        reduce_fn = _compiled_negative_predictive_value_reduce() if self.compile_reduce else self._reduce
+        return reduce_fn(tp, fp, tn, fn, average=self.average, multidim_average=self.multidim_average, multilabel=True)
+
+    def _sync_dist(self, dist_sync_fn: Callable = gather_all_tensors, process_group: Optional[Any] = None) -> None:
+        """Sync the sum-reduced statistics with an all-reduce, falling back to the default gather based logic."""
+        if not _sync_stat_scores_by_all_reduce(self, dist_sync_fn, process_group):
+            super()._sync_dist(dist_sync_fn, process_group)
 
+    @_disable_compile
     def plot(
         self, val: Optional[Union[Tensor, Sequence[Tensor]]] = None, ax: Optional[_AX_TYPE] = None
     ) -> _PLOT_OUT_TYPE:
@@ -456,6 +598,52 @@ class MultilabelNegativePredictiveValue(MultilabelStatScores):
         return self._plot(val, ax)
 
 
+def _build_binary_negative_predictive_value(
+    threshold: float,
+    num_classes: Optional[int],
+    num_labels: Optional[int],
+    average: Optional[Literal["micro", "macro", "weighted", "none"]],
+    top_k: Optional[int],
+    kwargs: dict[str, Any],
+) -> Metric:
+    return BinaryNegativePredictiveValue(threshold, **kwargs)
+
+
+def _build_multiclass_negative_predictive_value(
+    threshold: float,
+    num_classes: Optional[int],
+    num_labels: Optional[int],
+    average: Optional[Literal["micro", "macro", "weighted", "none"]],
+    top_k: Optional[int],
+    kwargs: dict[str, Any],
+) -> Metric:
+    if not isinstance(num_classes, int):
+        raise ValueError(f"`num_classes` is expected to be `int` but `{type(num_classes)} was passed.`")
+    if not isinstance(top_k, int):
+        raise ValueError(f"`top_k` is expected to be `int` but `{type(top_k)} was passed.`")
+    return MulticlassNegativePredictiveValue(num_classes, top_k, average, **kwargs)
+
+
+def _build_multilabel_negative_predictive_value(
+    threshold: float,
+    num_classes: Optional[int],
+    num_labels: Optional[int],
+    average: Optional[Literal["micro", "macro", "weighted", "none"]],
+    top_k: Optional[int],
+    kwargs: dict[str, Any],
+) -> Metric:
+    if not isinstance(num_labels, int):
+        raise ValueError(f"`num_labels` is expected to be `int` but `{type(num_labels)} was passed.`")
+    return MultilabelNegativePredictiveValue(num_labels, threshold, average, **kwargs)
+
+
+_NEGATIVE_PREDICTIVE_VALUE_BUILDERS: dict[ClassificationTask, Callable[..., Metric]] = {
+    ClassificationTask.BINARY: _build_binary_negative_predictive_value,
+    ClassificationTask.MULTICLASS: _build_multiclass_negative_predictive_value,
+    ClassificationTask.MULTILABEL: _build_multilabel_negative_predictive_value,
+}
+
+
 class NegativePredictiveValue(_ClassificationTaskWrapper):
     r"""Compute `Negative Predictive Value`_.
 
@@ -471,7 +659,7 @@ class NegativePredictiveValue(_ClassificationTaskWrapper):
     :class:`~torchmetrics.classification.BinaryNegativePredictiveValue`,
     :class:`~torchmetrics.classification.MulticlassNegativePredictiveValue`
     and :class:`~torchmetrics.classification.MultilabelNegativePredictiveValue` for the specific details of each
-    argument influence and examples.
+    argument influence and examples. Passing ``multidim_average=None`` is the same as ``multidim_average="global"``.
 
     Legacy Example:
         >>> from torch import tensor
@@ -500,23 +688,15 @@ class NegativePredictiveValue(_ClassificationTaskWrapper):
         **kwargs: Any,
     ) -> Metric:
         """Initialize task metric."""
-        task = ClassificationTask.from_str(task)
-        assert multidim_average is not None  # noqa: S101  # needed for mypy
+        if multidim_average is None:
+            multidim_average = "global"
+        task = _classification_task_from_str(task)
         kwargs.update({
             "multidim_average": multidim_average,
             "ignore_index": ignore_index,
             "validate_args": validate_args,
         })
-        if task == ClassificationTask.BINARY:
-            return BinaryNegativePredictiveValue(threshold, **kwargs)
-        if task == ClassificationTask.MULTICLASS:
-            if not isinstance(num_classes, int):
-                raise ValueError(f"`num_classes` is expected to be `int` but `{type(num_classes)} was passed.`")
-            if not isinstance(top_k, int):
-                raise ValueError(f"`top_k` is expected to be `int` but `{type(top_k)} was passed.`")
-            return MulticlassNegativePredictiveValue(num_classes, top_k, average, **kwargs)
-        if task == ClassificationTask.MULTILABEL:
-            if not isinstance(num_labels, int):
-                raise ValueError(f"`num_labels` is expected to be `int` but `{type(num_labels)} was passed.`")
-            return MultilabelNegativePredictiveValue(num_labels, threshold, average, **kwargs)
-        raise ValueError(f"Task {task} not supported!")
+        builder = _NEGATIVE_PREDICTIVE_VALUE_BUILDERS.get(task)
+        if builder is None:
+            raise ValueError(f"Task {task} not supported!")
+        return builder(threshold, num_classes, num_labels, average, top_k, kwargs)
@@ -11,8 +11,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Any, Optional, Union
+from typing import Any, Callable, Optional, Union
 
+import torch
 from torch import Tensor
 from typing_extensions import Literal
 
@@ -25,15 +26,16 @@ from torchmetrics.classification.precision_recall_curve import (
 from torchmetrics.functional.classification.sensitivity_specificity import (
     _binary_sensitivity_at_specificity_arg_validation,
     _binary_sensitivity_at_specificity_compute,
+    _compiled_sensitivity_at_specificity_compute,
     _multiclass_sensitivity_at_specificity_arg_validation,
     _multiclass_sensitivity_at_specificity_compute,
     _multilabel_sensitivity_at_specificity_arg_validation,
     _multilabel_sensitivity_at_specificity_compute,
 )
 from torchmetrics.metric import Metric
-from torchmetrics.utilities.data import dim_zero_cat as _cat
-from torchmetrics.utilities.enums import ClassificationTask
-from torchmetrics.utilities.imports import _MATPLOTLIB_AVAILABLE
+from torchmetrics.utilities.data import _dim_zero_cat_state
+from torchmetrics.utilities.enums import ClassificationTask, _classification_task_from_str
+from torchmetrics.utilities.imports import _MATPLOTLIB_AVAILABLE, _TORCH_GREATER_EQUAL_2_1
 
 if not _MATPLOTLIB_AVAILABLE:
     __doctest_skip__ = [
@@ -43,6 +45,58 @@ if not _MATPLOTLIB_AVAILABLE:
     ]
 
 
+def _check_compile_compute(compile_compute: bool) -> None:
+    """Validate the ``compile_compute`` argument shared by the sensitivity at specificity metrics."""
+    if not isinstance(compile_compute, bool):
+        raise ValueError(f"Expected argument `compile_compute` to be a `bool` but got {compile_compute}")
+    if compile_compute and not _TORCH_GREATER_EQUAL_2_1:
+        raise ValueError("Argument `compile_compute=True` requires `torch>=2.1`.")
+
+
+_LOG_THRESHOLDS_DEFAULT_STEPS = 100
+
+
+def _log_thresholds(
+    thresholds: Optional[Union[int, list[float], Tensor, str, tuple[str, int]]],
+) -> Optional[Union[int, list[float], Tensor]]:
+    """Convert the ``"log"`` and ``("log", steps)`` options of the ``thresholds`` argument into a tensor.
+
+    The thresholds ``1 - logspace(-6, 0, steps)`` are sorted ascending and are dense close to 1, where the specificity
+    is high. Any other value of ``thresholds`` is returned as is.
+
+    """
+    if not isinstance(thresholds, (str, tuple)):
+        return thresholds
+    name, steps = (thresholds, _LOG_THRESHOLDS_DEFAULT_STEPS) if isinstance(thresholds, str) else thresholds
+    if name != "log" or not isinstance(steps, int) or steps < 2:
+        raise ValueError(
+            "Expected argument `thresholds` given as a string or tuple to either be `'log'` or `('log', steps)` with"
+            f" an integer number of steps larger than 1, but got {thresholds}"
+        )
+    return (1 - torch.logspace(-6, 0, steps=steps)).flip(0)
+
+
+def _as_torch(x: Any) -> Tensor:
+    """Wrap inputs from other frameworks that implement the DLPack protocol as a tensor without copying them."""
+    if not isinstance(x, Tensor) and hasattr(x, "__dlpack__"):
+        return torch.from_dlpack(x)
+    return x
+
+
+def _to_state_device(x: Tensor, device: torch.device) -> Tensor:
+    """Move a CPU input to the device of a binned CUDA state, any other input is returned as is.
+
+    The input is staged in pinned memory, such that the host to device copy is asynchronous and overlaps with the
+    kernels still running on the device instead of stalling the host. The pinned staging blocks are recycled by the
+    caching host allocator once the copies using them have finished. The copy is issued on the current stream, such
+    that the kernels of the update that follow are ordered after it.
+
+    """
+    if x.device.type == "cpu" and device.type == "cuda":
+        return x.pin_memory().to(device, non_blocking=True)
+    return x
+
+
 class BinarySensitivityAtSpecificity(BinaryPrecisionRecallCurve):
     r"""Compute the highest possible sensitivity value given the minimum specificity thresholds provided.
 
@@ -58,12 +112,17 @@ class BinarySensitivityAtSpecificity(BinaryPrecisionRecallCurve):
       only contain {0,1} values (except if `ignore_index` is specified).
 
     Additional dimension ``...`` will be flattened into the batch dimension.
+    Inputs from other frameworks (e.g. JAX, CuPy or NumPy) that implement the DLPack protocol are accepted as well and
+    are wrapped without copying them. Half precision predictions are not upcast. Specificity is always computed in
+    single precision (FP32) before it is compared against ``min_specificity``.
 
     The implementation both supports calculating the metric in a non-binned but accurate version and a binned version
     that is less accurate but more memory efficient. Setting the `thresholds` argument to `None` will activate the
     non-binned  version that uses memory of size :math:`\mathcal{O}(n_{samples})` whereas setting the `thresholds`
     argument to either an integer, list or a 1d tensor will use a binned version that uses memory of
-    size :math:`\mathcal{O}(n_{thresholds})` (constant memory).
+    size :math:`\mathcal{O}(n_{thresholds})` (constant memory). In the binned version, CPU inputs to a metric on a CUDA
+    device are copied asynchronously to that device. The non-binned version stores the inputs on the device they are
+    passed on, such that they can be kept on the CPU to save device memory.
 
     Args:
         min_specificity: float value specifying minimum specificity threshold.
@@ -77,9 +136,23 @@ class BinarySensitivityAtSpecificity(BinaryPrecisionRecallCurve):
             - ``list`` of floats, will use the indicated thresholds in the list as bins for the calculation
             - 1d ``tensor`` of floats, will use the indicated thresholds in the tensor as
               bins for the calculation.
+            - ``"log"`` or ``("log", steps)``, will use ``steps`` (by default 100) thresholds
+              ``1 - logspace(-6, 0, steps)`` as bins for the calculation. These are dense close to 1, where the
+              specificity is high, such that fewer bins are needed than with linearly spaced thresholds for a high
+              ``min_specificity``. The bins are coarse close to 0, so prefer linearly spaced thresholds when
+              ``min_specificity`` is close to 0.
 
         validate_args: bool indicating if input arguments and tensors should be validated for correctness.
             Set to ``False`` for faster computations.
+        preds_quantization_bits:
+            Only used by the non-binned version (``thresholds=None``). If set to an integer between 1 and 8, the
+            probabilities are rounded to ``2**preds_quantization_bits`` evenly spaced levels and stored as
+            ``torch.uint8``, which needs 4 times less memory than storing them as float. The returned threshold is
+            then one of these levels. Predictions outside ``[0, 1]``, which can only occur with
+            ``normalization=None``, are clamped to that range. ``None`` stores the probabilities as is.
+        compile_compute: bool indicating if the computation of the curve and the sensitivity in ``compute`` should be
+            compiled with ``torch.compile``. Requires ``torch>=2.1``. The first call to ``compute`` will be slower as it
+            triggers the compilation.
         kwargs: Additional keyword arguments, see :ref:`Metric kwargs` for more info.
 
     Returns:
@@ -111,21 +184,57 @@ class BinarySensitivityAtSpecificity(BinaryPrecisionRecallCurve):
     def __init__(
         self,
         min_specificity: float,
-        thresholds: Optional[Union[int, list[float], Tensor]] = None,
+        thresholds: Optional[Union[int, list[float], Tensor, Literal["log"], tuple[str, int]]] = None,
         ignore_index: Optional[int] = None,
         validate_args: bool = True,
+        preds_quantization_bits: Optional[int] = None,
+        compile_compute: bool = False,
         **kwargs: Any,
     ) -> None:
+        thresholds = _log_thresholds(thresholds)
         super().__init__(thresholds, ignore_index, validate_args=False, **kwargs)
         if validate_args:
             _binary_sensitivity_at_specificity_arg_validation(min_specificity, thresholds, ignore_index)
+            _check_compile_compute(compile_compute)
+        # checked regardless of ``validate_args``, as an invalid number of bits silently wraps around in ``torch.uint8``
+        if preds_quantization_bits is not None and not (
+            isinstance(preds_quantization_bits, int) and 1 <= preds_quantization_bits <= 8
+        ):
+            raise ValueError(
+                "Expected argument `preds_quantization_bits` to either be `None` or an integer between 1 and 8,"
+                f" but got {preds_quantization_bits}"
+            )
         self.validate_args = validate_args
         self.min_specificity = min_specificity
+        self.preds_quantization_bits = preds_quantization_bits
+        self.compile_compute = compile_compute
+
+    def update(self, preds: Any, target: Any) -> None:
+        """Update metric states with tensors or with inputs that implement the DLPack protocol."""
+        preds, target = _as_torch(preds), _as_torch(target)
+        if self.thresholds is not None:
+            device = self.confmat.device
+            preds, target = _to_state_device(preds, device), _to_state_device(target, device)
+        super().update(preds, target)
+        bits = self.preds_quantization_bits
+        if self.thresholds is None and bits is not None:
+            # predictions are only guaranteed to be probabilities when they are normalized, clamp to the levels
+            self.preds[-1] = torch.round(self.preds[-1].clamp(0, 1) * (2**bits - 1)).to(torch.uint8)
 
     def compute(self) -> tuple[Tensor, Tensor]:  # type: ignore[override]
         """Compute metric."""
-        state = (_cat(self.preds), _cat(self.target)) if self.thresholds is None else self.confmat
-        return _binary_sensitivity_at_specificity_compute(state, self.thresholds, self.min_specificity)
+        compute_fn = _binary_sensitivity_at_specificity_compute
+        if self.compile_compute:
+            compute_fn = _compiled_sensitivity_at_specificity_compute(compute_fn)
+        # when binned, ``thresholds`` is a buffer, which is looked up through ``nn.Module.__getattr__`` on every access
+        thresholds = self.thresholds
+        if thresholds is None:
+            preds, target = _dim_zero_cat_state(self, "preds"), _dim_zero_cat_state(self, "target")
+            bits = self.preds_quantization_bits
+            if bits is not None:
+                preds = preds / (2**bits - 1)
+            return compute_fn((preds, target), None, self.min_specificity)
+        return compute_fn(self.confmat, thresholds, self.min_specificity)
 
 
 class MulticlassSensitivityAtSpecificity(MulticlassPrecisionRecallCurve):
@@ -147,6 +256,8 @@ class MulticlassSensitivityAtSpecificity(MulticlassPrecisionRecallCurve):
       only contain values in the [0, n_classes-1] range (except if `ignore_index` is specified).
 
     Additional dimension ``...`` will be flattened into the batch dimension.
+    Inputs that implement the DLPack protocol, half precision predictions and CPU inputs to a metric on a CUDA device
+    are handled as described for :class:`~torchmetrics.classification.BinarySensitivityAtSpecificity`.
 
     The implementation both supports calculating the metric in a non-binned but accurate version and a binned version
     that is less accurate but more memory efficient. Setting the `thresholds` argument to `None` will activate the
@@ -170,6 +281,9 @@ class MulticlassSensitivityAtSpecificity(MulticlassPrecisionRecallCurve):
 
         validate_args: bool indicating if input arguments and tensors should be validated for correctness.
             Set to ``False`` for faster computations.
+        compile_compute: bool indicating if the computation of the curve and the sensitivity in ``compute`` should be
+            compiled with ``torch.compile``. Requires ``torch>=2.1``. The first call to ``compute`` will be slower as it
+            triggers the compilation.
         kwargs: Additional keyword arguments, see :ref:`Metric kwargs` for more info.
 
     Returns:
@@ -211,6 +325,7 @@ class MulticlassSensitivityAtSpecificity(MulticlassPrecisionRecallCurve):
         thresholds: Optional[Union[int, list[float], Tensor]] = None,
         ignore_index: Optional[int] = None,
         validate_args: bool = True,
+        compile_compute: bool = False,
         **kwargs: Any,
     ) -> None:
         super().__init__(
@@ -220,15 +335,31 @@ class MulticlassSensitivityAtSpecificity(MulticlassPrecisionRecallCurve):
             _multiclass_sensitivity_at_specificity_arg_validation(
                 num_classes, min_specificity, thresholds, ignore_index
             )
+            _check_compile_compute(compile_compute)
         self.validate_args = validate_args
         self.min_specificity = min_specificity
+        self.compile_compute = compile_compute
+
+    def update(self, preds: Any, target: Any) -> None:
+        """Update metric states with tensors or with inputs that implement the DLPack protocol."""
+        preds, target = _as_torch(preds), _as_torch(target)
+        if self.thresholds is not None:
+            device = self.confmat.device
+            preds, target = _to_state_device(preds, device), _to_state_device(target, device)
+        super().update(preds, target)
 
     def compute(self) -> tuple[Tensor, Tensor]:  # type: ignore[override]
         """Compute metric."""
-        state = (_cat(self.preds), _cat(self.target)) if self.thresholds is None else self.confmat
-        return _multiclass_sensitivity_at_specificity_compute(
-            state, self.num_classes, self.thresholds, self.min_specificity
-        )
+        thresholds = self.thresholds
+        state: Union[Tensor, tuple[Tensor, Tensor]]
+        if thresholds is None:
+            state = (_dim_zero_cat_state(self, "preds"), _dim_zero_cat_state(self, "target"))
+        else:
+            state = self.confmat
+        compute_fn = _multiclass_sensitivity_at_specificity_compute
+        if self.compile_compute:
+            compute_fn = _compiled_sensitivity_at_specificity_compute(compute_fn)
+        return compute_fn(state, self.num_classes, thresholds, self.min_specificity)
 
 
 class MultilabelSensitivityAtSpecificity(MultilabelPrecisionRecallCurve):
@@ -246,6 +377,8 @@ class MultilabelSensitivityAtSpecificity(MultilabelPrecisionRecallCurve):
       only contain {0,1} values (except if `ignore_index` is specified).
 
     Additional dimension ``...`` will be flattened into the batch dimension.
+    Inputs that implement the DLPack protocol, half precision predictions and CPU inputs to a metric on a CUDA device
+    are handled as described for :class:`~torchmetrics.classification.BinarySensitivityAtSpecificity`.
 
     The implementation both supports calculating the metric in a non-binned but accurate version and a binned version
     that is less accurate but more memory efficient. Setting the `thresholds` argument to `None` will activate the
@@ -269,6 +402,9 @@ class MultilabelSensitivityAtSpecificity(MultilabelPrecisionRecallCurve):
 
         validate_args: bool indicating if input arguments and tensors should be validated for correctness.
             Set to ``False`` for faster computations.
+        compile_compute: bool indicating if the computation of the curve and the sensitivity in ``compute`` should be
+            compiled with ``torch.compile``. Requires ``torch>=2.1``. The first call to ``compute`` will be slower as it
+            triggers the compilation.
         kwargs: Additional keyword arguments, see :ref:`Metric kwargs` for more info.
 
     Returns:
@@ -312,6 +448,7 @@ class MultilabelSensitivityAtSpecificity(MultilabelPrecisionRecallCurve):
         thresholds: Optional[Union[int, list[float], Tensor]] = None,
         ignore_index: Optional[int] = None,
         validate_args: bool = True,
+        compile_compute: bool = False,
         **kwargs: Any,
     ) -> None:
         super().__init__(
@@ -319,15 +456,82 @@ class MultilabelSensitivityAtSpecificity(MultilabelPrecisionRecallCurve):
         )
         if validate_args:
             _multilabel_sensitivity_at_specificity_arg_validation(num_labels, min_specificity, thresholds, ignore_index)
+            _check_compile_compute(compile_compute)
         self.validate_args = validate_args
         self.min_specificity = min_specificity
+        self.compile_compute = compile_compute
+
+    def update(self, preds: Any, target: Any) -> None:
+        """Update metric states with tensors or with inputs that implement the DLPack protocol."""
+        preds, target = _as_torch(preds), _as_torch(target)
+        if self.thresholds is not None:
+            device = self.confmat.device
+            preds, target = _to_state_device(preds, device), _to_state_device(target, device)
+        super().update(preds, target)
 
     def compute(self) -> tuple[Tensor, Tensor]:  # type: ignore[override]
         """Compute metric."""
-        state = (_cat(self.preds), _cat(self.target)) if self.thresholds is None else self.confmat
-        return _multilabel_sensitivity_at_specificity_compute(
-            state, self.num_labels, self.thresholds, self.ignore_index, self.min_specificity
-        )
+        thresholds = self.thresholds
+        state: Union[Tensor, tuple[Tensor, Tensor]]
+        if thresholds is None:
+            state = (_dim_zero_cat_state(self, "preds"), _dim_zero_cat_state(self, "target"))
+        else:
+            state = self.confmat
+        compute_fn = _multilabel_sensitivity_at_specificity_compute
+        if self.compile_compute:
+            compute_fn = _compiled_sensitivity_at_specificity_compute(compute_fn)
+        return compute_fn(state, self.num_labels, thresholds, self.ignore_index, self.min_specificity)
+
+
+def _build_binary_sensitivity_at_specificity(
+    min_specificity: float,
+    thresholds: Optional[Union[int, list[float], Tensor]],
+    num_classes: Optional[int],
+    num_labels: Optional[int],
+    ignore_index: Optional[int],
+    validate_args: bool,
+    kwargs: dict[str, Any],
+) -> Metric:
+    return BinarySensitivityAtSpecificity(min_specificity, thresholds, ignore_index, validate_args, **kwargs)
+
+
+def _build_multiclass_sensitivity_at_specificity(
+    min_specificity: float,
+    thresholds: Optional[Union[int, list[float], Tensor]],
+    num_classes: Optional[int],
+    num_labels: Optional[int],
+    ignore_index: Optional[int],
+    validate_args: bool,
+    kwargs: dict[str, Any],
+) -> Metric:
+    if not isinstance(num_classes, int):
+        raise ValueError(f"`num_classes` is expected to be `int` but `{type(num_classes)} was passed.`")
+    return MulticlassSensitivityAtSpecificity(
+        num_classes, min_specificity, thresholds, ignore_index, validate_args, **kwargs
+    )
+
+
+def _build_multilabel_sensitivity_at_specificity(
+    min_specificity: float,
+    thresholds: Optional[Union[int, list[float], Tensor]],
+    num_classes: Optional[int],
+    num_labels: Optional[int],
+    ignore_index: Optional[int],
+    validate_args: bool,
+    kwargs: dict[str, Any],
+) -> Metric:
+    if not isinstance(num_labels, int):
+        raise ValueError(f"`num_labels` is expected to be `int` but `{type(num_labels)} was passed.`")
+    return MultilabelSensitivityAtSpecificity(
+        num_labels, min_specificity, thresholds, ignore_index, validate_args, **kwargs
+    )
+
+
+_SENSITIVITY_AT_SPECIFICITY_BUILDERS: dict[ClassificationTask, Callable[..., Metric]] = {
+    ClassificationTask.BINARY: _build_binary_sensitivity_at_specificity,
+    ClassificationTask.MULTICLASS: _build_multiclass_sensitivity_at_specificity,
+    ClassificationTask.MULTILABEL: _build_multilabel_sensitivity_at_specificity,
+}
 
 
 class SensitivityAtSpecificity(_ClassificationTaskWrapper):
@@ -357,19 +561,8 @@ class SensitivityAtSpecificity(_ClassificationTaskWrapper):
         **kwargs: Any,
     ) -> Metric:
         """Initialize task metric."""
-        task = ClassificationTask.from_str(task)
-        if task == ClassificationTask.BINARY:
-            return BinarySensitivityAtSpecificity(min_specificity, thresholds, ignore_index, validate_args, **kwargs)
-        if task == ClassificationTask.MULTICLASS:
-            if not isinstance(num_classes, int):
-                raise ValueError(f"`num_classes` is expected to be `int` but `{type(num_classes)} was passed.`")
-            return MulticlassSensitivityAtSpecificity(
-                num_classes, min_specificity, thresholds, ignore_index, validate_args, **kwargs
-            )
-        if task == ClassificationTask.MULTILABEL:
-            if not isinstance(num_labels, int):
-                raise ValueError(f"`num_labels` is expected to be `int` but `{type(num_labels)} was passed.`")
-            return MultilabelSensitivityAtSpecificity(
-                num_labels, min_specificity, thresholds, ignore_index, validate_args, **kwargs
-            )
-        raise ValueError(f"Task {task} not supported!")
+        task = _classification_task_from_str(task)
+        builder = _SENSITIVITY_AT_SPECIFICITY_BUILDERS.get(task)
+        if builder is None:
+            raise ValueError(f"Task {task} not supported!")
+        return builder(min_specificity, thresholds, num_classes, num_labels, ignore_index, validate_args, kwargs)
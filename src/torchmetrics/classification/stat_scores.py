@@ -36,7 +36,7 @@ from torchmetrics.functional.classification.stat_scores import (
     _multilabel_stat_scores_update,
 )
 from torchmetrics.metric import Metric
-from torchmetrics.utilities.data import dim_zero_cat
+from torchmetrics.utilities.data import _dim_zero_cat_state
 from torchmetrics.utilities.enums import ClassificationTask
 
 
@@ -46,6 +46,11 @@ class _AbstractStatScores(Metric):
     tn: Union[List[Tensor], Tensor]
     fn: Union[List[Tensor], Tensor]
 
+    # dtype to store the per-sample statistics in when ``multidim_average="samplewise"``, ``None`` keeps the dtype of
+    # the update. Each value is bounded by the number of elements in a single sample, so a smaller integer type is
+    # safe for metrics that do not return the raw statistics. Globally accumulated states always stay ``torch.long``.
+    _samplewise_state_dtype: Optional[torch.dtype] = None
+
     # define common functions
     def _create_state(
         self,
@@ -69,6 +74,8 @@ class _AbstractStatScores(Metric):
     def _update_state(self, tp: Tensor, fp: Tensor, tn: Tensor, fn: Tensor) -> None:
         """Update states depending on multidim_average argument."""
         if self.multidim_average == "samplewise":
+            if self._samplewise_state_dtype is not None:
+                tp, fp, tn, fn = (x.to(self._samplewise_state_dtype) for x in (tp, fp, tn, fn))
             self.tp.append(tp)  # type: ignore[union-attr]
             self.fp.append(fp)  # type: ignore[union-attr]
             self.tn.append(tn)  # type: ignore[union-attr]
@@ -80,11 +87,16 @@ class _AbstractStatScores(Metric):
             self.fn = self.fn + fn if not isinstance(self.fn, list) else [*self.fn, fn]
 
     def _final_state(self) -> tuple[Tensor, Tensor, Tensor, Tensor]:
-        """Aggregate states that are lists and return final states."""
-        tp = dim_zero_cat(self.tp)
-        fp = dim_zero_cat(self.fp)
-        tn = dim_zero_cat(self.tn)
-        fn = dim_zero_cat(self.fn)
+        """Aggregate states that are lists and return final states.
+
+        List states are compacted in place after concatenation, such that repeated calls without new updates in
+        between (e.g. ``compute`` with ``compute_with_cache=False``) do not concatenate the same batches again.
+
+        """
+        tp = _dim_zero_cat_state(self, "tp")
+        fp = _dim_zero_cat_state(self, "fp")
+        tn = _dim_zero_cat_state(self, "tn")
+        fn = _dim_zero_cat_state(self, "fn")
         return tp, fp, tn, fn
 
 
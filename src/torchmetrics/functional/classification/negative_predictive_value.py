@@ -11,8 +11,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional
 
+import torch
 from torch import Tensor
 from typing_extensions import Literal
 
@@ -32,6 +34,7 @@ from torchmetrics.functional.classification.stat_scores import (
 )
 from torchmetrics.utilities.compute import _adjust_weights_safe_divide, _safe_divide
 from torchmetrics.utilities.enums import ClassificationTask
+from torchmetrics.utilities.imports import _TORCH_GREATER_EQUAL_2_1
 
 
 def _negative_predictive_value_reduce(
@@ -46,16 +49,35 @@ def _negative_predictive_value_reduce(
     zero_division: float = 0,
 ) -> Tensor:
     """Reduction logic for negative predictive value."""
-    if average == "binary":
-        return _safe_divide(tn, tn + fn, zero_division)
+    # all averaging modes share a single guarded division, they only differ in what happens before and after it
     if average == "micro":
-        tn = tn.sum(dim=0 if multidim_average == "global" else 1)
-        fn = fn.sum(dim=0 if multidim_average == "global" else 1)
-        return _safe_divide(tn, tn + fn, zero_division)
-    score = _safe_divide(tn, tn + fn, zero_division)
+        sum_dim = 0 if multidim_average == "global" else 1
+        tn = tn.sum(dim=sum_dim)
+        fn = fn.sum(dim=sum_dim)
+    if tn.is_floating_point() or not isinstance(zero_division, (float, int)):
+        score = _safe_divide(tn, tn + fn, zero_division)
+    else:
+        # the upcast of ``tn`` is a new tensor owned by this function, so the division is written into it instead of
+        # allocating another output of the same size
+        denom = tn + fn
+        score = tn.float().div_(denom).masked_fill_(denom == 0, zero_division)
+    if average in ("binary", "micro"):
+        return score
     return _adjust_weights_safe_divide(score, average, multilabel, tp, fp, fn, top_k=top_k)
 
 
+@lru_cache(maxsize=1)
+def _compiled_negative_predictive_value_reduce() -> Callable[..., Tensor]:
+    """Return the reduction logic compiled with ``torch.compile``.
+
+    Compilation is deferred until the first call, such that importing the module does not pay the compile cost.
+
+    """
+    if not _TORCH_GREATER_EQUAL_2_1:
+        raise RuntimeError("Compiling the negative predictive value reduction requires `torch>=2.1`.")
+    return torch.compile(_negative_predictive_value_reduce, dynamic=True)
+
+
 def binary_negative_predictive_value(
     preds: Tensor,
     target: Tensor,
@@ -203,10 +203,8 @@ def _binary_precision_recall_curve_update(
     if thresholds is None:
         return preds, target
     if preds.numel() <= 50_000:
-        update_fn = _binary_precision_recall_curve_update_vectorized
-    else:
-        update_fn = _binary_precision_recall_curve_update_loop
-    return update_fn(preds, target, thresholds)
+        return _binary_precision_recall_curve_update_vectorized(preds, target, thresholds)
+    return _precision_recall_curve_update_searchsorted(preds, target, thresholds)
 
 
 def _binary_precision_recall_curve_update_vectorized(
@@ -216,8 +214,8 @@ def _binary_precision_recall_curve_update_vectorized(
 ) -> Union[Tensor, tuple[Tensor, Tensor]]:
     """Return the multi-threshold confusion matrix to calculate the pr-curve with.
 
-    This implementation is vectorized and faster than `_binary_precision_recall_curve_update_loop` for small
-    numbers of samples (up to 50k) but less memory- and time-efficient for more samples.
+    This implementation is vectorized and faster than `_precision_recall_curve_update_searchsorted` for small
+    numbers of samples (up to 50k), but its memory scales with the number of samples times the number of thresholds.
 
     """
     len_t = len(thresholds)
@@ -227,29 +225,53 @@ def _binary_precision_recall_curve_update_vectorized(
     return bins.reshape(len_t, 2, 2)
 
 
-def _binary_precision_recall_curve_update_loop(
+def _precision_recall_curve_update_searchsorted(
     preds: Tensor,
     target: Tensor,
     thresholds: Tensor,
-) -> Union[Tensor, tuple[Tensor, Tensor]]:
-    """Return the multi-threshold confusion matrix to calculate the pr-curve with.
+) -> Tensor:
+    """Return the multi-threshold confusion matrix to calculate the pr-curve with, by binning the predictions.
 
-    This implementation loops over thresholds and is more memory-efficient than
-    `_binary_precision_recall_curve_update_vectorized`. However, it is slowwer for small
-    numbers of samples (up to 50k).
+    Instead of comparing every prediction against every threshold, each prediction is mapped to the number of
+    thresholds it reaches with a single ``torch.searchsorted``. These bin indices are counted per target value and a
+    reversed cumulative sum over the bins then gives the number of positive predictions for every threshold. Memory
+    therefore scales with the number of samples plus the number of thresholds, not with their product, which makes it
+    the implementation used for large numbers of samples. It is shared by the binary, multiclass (with one-hot
+    targets) and multilabel tasks. The bins are accumulated with ``scatter_add_`` instead of ``_bincount``, whose
+    fallback for deterministic mode, XLA and MPS would allocate a tensor of size number of samples times number of bins.
+
+    Args:
+        preds: tensor of shape ``(N, ...)`` with the probabilities
+        target: tensor of the same shape with values ``0`` or ``1``, all other values are ignored
+        thresholds: 1d tensor of thresholds, which does not need to be sorted
+
+    Returns:
+        confusion matrix of shape ``(len(thresholds), ..., 2, 2)``
 
     """
     len_t = len(thresholds)
-    target = target == 1
-    confmat = thresholds.new_empty((len_t, 2, 2), dtype=torch.int64)
-    # Iterate one threshold at a time to conserve memory
-    for i in range(len_t):
-        preds_t = preds >= thresholds[i]
-        confmat[i, 1, 1] = (target & preds_t).sum()
-        confmat[i, 0, 1] = ((~target) & preds_t).sum()
-        confmat[i, 1, 0] = (target & (~preds_t)).sum()
-    confmat[:, 0, 0] = len(preds_t) - confmat[:, 0, 1] - confmat[:, 1, 0] - confmat[:, 1, 1]
-    return confmat
+    num_samples, shape = preds.shape[0], preds.shape[1:]
+    sorted_thresholds, order = thresholds.sort()
+    dtype = torch.promote_types(preds.dtype, sorted_thresholds.dtype)
+    # a nan prediction is never above a threshold, which the comparison based updates implicitly assume as well
+    preds = preds.reshape(num_samples, -1).to(dtype).nan_to_num(nan=float("-inf"))
+    target = target.reshape(num_samples, -1).long()
+    num_cols = preds.shape[1]
+    # the prediction is positive for exactly the (sorted) thresholds before this index
+    idx = torch.searchsorted(sorted_thresholds.to(dtype).contiguous(), preds.contiguous(), right=True)
+    mapping = idx + (len_t + 1) * target + 2 * (len_t + 1) * torch.arange(num_cols, device=preds.device)
+    # ignored entries are counted in an extra bin which is dropped afterwards, avoiding a device-host sync
+    num_bins = 2 * (len_t + 1) * num_cols
+    mapping = torch.where((target == 0) | (target == 1), mapping, num_bins)
+    mapping = mapping.flatten()
+    bins = torch.zeros(num_bins + 1, dtype=torch.long, device=mapping.device)
+    bins.scatter_add_(0, mapping, torch.ones_like(mapping))
+    bins = bins[:num_bins].reshape(num_cols, 2, len_t + 1)
+    pos = bins.flip(-1).cumsum(-1).flip(-1)[..., 1:]
+    neg = bins.sum(-1, keepdim=True) - pos
+    confmat = torch.stack([neg, pos], dim=-1).permute(2, 0, 1, 3)  # num_thresholds x num_cols x 2 x 2
+    confmat = confmat[order.argsort()]
+    return confmat.reshape(len_t, *shape, 2, 2)
 
 
 def _binary_precision_recall_curve_compute(
@@ -480,10 +502,9 @@ def _multiclass_precision_recall_curve_update(
     if average == "micro":
         return _binary_precision_recall_curve_update(preds, target, thresholds)
     if preds.numel() * num_classes <= 1_000_000:
-        update_fn = _multiclass_precision_recall_curve_update_vectorized
-    else:
-        update_fn = _multiclass_precision_recall_curve_update_loop
-    return update_fn(preds, target, num_classes, thresholds)
+        return _multiclass_precision_recall_curve_update_vectorized(preds, target, num_classes, thresholds)
+    target = torch.nn.functional.one_hot(target, num_classes=num_classes)
+    return _precision_recall_curve_update_searchsorted(preds, target, thresholds)
 
 
 def _multiclass_precision_recall_curve_update_vectorized(
@@ -494,8 +515,8 @@ def _multiclass_precision_recall_curve_update_vectorized(
 ) -> Union[Tensor, tuple[Tensor, Tensor]]:
     """Return the multi-threshold confusion matrix to calculate the pr-curve with.
 
-    This implementation is vectorized and faster than `_binary_precision_recall_curve_update_loop` for small
-    numbers of samples but less memory- and time-efficient for more samples.
+    This implementation is vectorized and faster than `_precision_recall_curve_update_searchsorted` for small
+    numbers of samples, but its memory scales with the number of samples times the number of classes and thresholds.
 
     """
     len_t = len(thresholds)
@@ -508,32 +529,6 @@ def _multiclass_precision_recall_curve_update_vectorized(
     return bins.reshape(len_t, num_classes, 2, 2)
 
 
-def _multiclass_precision_recall_curve_update_loop(
-    preds: Tensor,
-    target: Tensor,
-    num_classes: int,
-    thresholds: Tensor,
-) -> Union[Tensor, tuple[Tensor, Tensor]]:
-    """Return the state to calculate the pr-curve with.
-
-    This implementation loops over thresholds and is more memory-efficient than
-    `_binary_precision_recall_curve_update_vectorized`. However, it is slowwer for small
-    numbers of samples.
-
-    """
-    len_t = len(thresholds)
-    target_t = torch.nn.functional.one_hot(target, num_classes=num_classes)
-    confmat = thresholds.new_empty((len_t, num_classes, 2, 2), dtype=torch.int64)
-    # Iterate one threshold at a time to conserve memory
-    for i in range(len_t):
-        preds_t = preds >= thresholds[i]
-        confmat[i, :, 1, 1] = (target_t & preds_t).sum(dim=0)
-        confmat[i, :, 0, 1] = ((~target_t) & preds_t).sum(dim=0)
-        confmat[i, :, 1, 0] = (target_t & (~preds_t)).sum(dim=0)
-    confmat[:, :, 0, 0] = len(preds_t) - confmat[:, :, 0, 1] - confmat[:, :, 1, 0] - confmat[:, :, 1, 1]
-    return confmat
-
-
 def _multiclass_precision_recall_curve_compute(
     state: Union[Tensor, tuple[Tensor, Tensor]],
     num_classes: int,
@@ -789,6 +784,9 @@ def _multilabel_precision_recall_curve_update(
     """
     if thresholds is None:
         return preds, target
+    if preds.numel() * num_labels > 1_000_000:
+        # ignored entries are marked with negative targets by the formatting and skipped by the binning
+        return _precision_recall_curve_update_searchsorted(preds, target, thresholds)
     len_t = len(thresholds)
     # num_samples x num_labels x num_thresholds
     preds_t = (preds.unsqueeze(-1) >= thresholds.unsqueeze(0).unsqueeze(0)).long()
@@ -11,7 +11,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import List, Optional, Union
+from functools import cache
+from typing import Callable, List, Optional, Union
 
 import torch
 from torch import Tensor
@@ -36,7 +37,9 @@ from torchmetrics.functional.classification.roc import (
     _multiclass_roc_compute,
     _multilabel_roc_compute,
 )
+from torchmetrics.utilities.compute import _safe_divide
 from torchmetrics.utilities.enums import ClassificationTask
+from torchmetrics.utilities.imports import _TORCH_GREATER_EQUAL_2_1
 
 
 def _convert_fpr_to_specificity(fpr: Tensor) -> Tensor:
@@ -50,24 +53,54 @@ def _sensitivity_at_specificity(
     thresholds: Tensor,
     min_specificity: float,
 ) -> tuple[Tensor, Tensor]:
-    # get indices where specificity is greater than min_specificity
+    """Find the highest sensitivity with a specificity of at least ``min_specificity``.
+
+    Works on a single curve of shape ``(T,)`` or on ``(C, T)`` curves that share the same thresholds at once.
+    Non-qualifying points are masked out before a single ``argmax`` over the threshold dimension, which returns the
+    first maximum. Curves without any qualifying point get ``0.0`` and ``1e6``. This avoids synchronizing with the
+    device to check if any point qualifies.
+
+    """
     indices = specificity >= min_specificity
+    idx = torch.where(indices, sensitivity, -1.0).argmax(dim=-1)
+    found = indices.any(dim=-1)
+    max_spec = torch.where(found, sensitivity.gather(-1, idx.unsqueeze(-1)).squeeze(-1), 0.0)
+    best_threshold = torch.where(found, thresholds[idx], 1e6)
+    return max_spec, best_threshold
 
-    # if no indices are found, max_spec, best_threshold = 0.0, 1e6
-    if not indices.any():
-        max_spec = torch.tensor(0.0, device=sensitivity.device, dtype=sensitivity.dtype)
-        best_threshold = torch.tensor(1e6, device=thresholds.device, dtype=thresholds.dtype)
-    else:
-        # redefine sensitivity, specificity and threshold tensor based on indices
-        sensitivity, specificity, thresholds = sensitivity[indices], specificity[indices], thresholds[indices]
 
-        # get argmax
-        idx = torch.argmax(sensitivity)
+def _binned_sensitivity_at_specificity(
+    confmat: Tensor, thresholds: Tensor, min_specificity: float
+) -> tuple[Tensor, Tensor]:
+    """Find the highest sensitivity per class directly from a binned ``(T, C, 2, 2)`` confusion matrix.
 
-        # get max_spec and best_threshold
-        max_spec, best_threshold = sensitivity[idx], thresholds[idx]
+    The counts are laid out once as a contiguous ``(C, T, 4)`` tensor with the thresholds in descending order, such
+    that the rates of all classes are computed with elementwise ops along the contiguous threshold dimension instead of
+    going through the strided slices and transposes of the ROC computation.
 
-    return max_spec, best_threshold
+    """
+    counts = confmat.flip(0).transpose(0, 1).reshape(confmat.shape[1], confmat.shape[0], 4)
+    tn, fp, fn, tp = counts.unbind(-1)
+    sensitivity = _safe_divide(tp, tp + fn)
+    if min_specificity == 0:
+        # every threshold reaches a specificity of at least 0, such that the specificity is not needed
+        idx = sensitivity.argmax(dim=-1)
+        return sensitivity.gather(-1, idx.unsqueeze(-1)).squeeze(-1), thresholds.flip(0)[idx]
+    specificity = _convert_fpr_to_specificity(_safe_divide(fp, fp + tn))
+    return _sensitivity_at_specificity(sensitivity, specificity, thresholds.flip(0), min_specificity)
+
+
+@cache
+def _compiled_sensitivity_at_specificity_compute(compute_fn: Callable) -> Callable:
+    """Return ``compute_fn`` compiled with ``torch.compile``.
+
+    Compilation is deferred until the first call and cached per compute function, such that importing the module does
+    not pay the compile cost and all metric instances share the compiled function.
+
+    """
+    if not _TORCH_GREATER_EQUAL_2_1:
+        raise RuntimeError("Compiling the sensitivity at specificity computation requires `torch>=2.1`.")
+    return torch.compile(compute_fn, dynamic=True)
 
 
 def _binary_sensitivity_at_specificity_arg_validation(
@@ -88,6 +121,9 @@ def _binary_sensitivity_at_specificity_compute(
     min_specificity: float,
     pos_label: int = 1,
 ) -> tuple[Tensor, Tensor]:
+    if isinstance(state, Tensor) and thresholds is not None:
+        sensitivity, thresholds = _binned_sensitivity_at_specificity(state.unsqueeze(1), thresholds, min_specificity)
+        return sensitivity[0], thresholds[0]
     fpr, sensitivity, thresholds = _binary_roc_compute(state, thresholds, pos_label)
     specificity = _convert_fpr_to_specificity(fpr)
     return _sensitivity_at_specificity(sensitivity, specificity, thresholds, min_specificity)
@@ -185,18 +221,15 @@ def _multiclass_sensitivity_at_specificity_compute(
     thresholds: Optional[Tensor],
     min_specificity: float,
 ) -> tuple[Tensor, Tensor]:
+    if isinstance(state, Tensor) and thresholds is not None:
+        # all classes share the same thresholds, such that the search can be done for all of them at once
+        return _binned_sensitivity_at_specificity(state, thresholds, min_specificity)
     fpr, sensitivity, thresholds = _multiclass_roc_compute(state, num_classes, thresholds)
     specificity = [_convert_fpr_to_specificity(fpr_) for fpr_ in fpr]
-    if isinstance(state, Tensor):
-        res = [
-            _sensitivity_at_specificity(sp, sn, thresholds, min_specificity)  # type: ignore
-            for sp, sn in zip(sensitivity, specificity)
-        ]
-    else:
-        res = [
-            _sensitivity_at_specificity(sp, sn, t, min_specificity)
-            for sp, sn, t in zip(sensitivity, specificity, thresholds)
-        ]
+    res = [
+        _sensitivity_at_specificity(sp, sn, t, min_specificity)
+        for sp, sn, t in zip(sensitivity, specificity, thresholds)
+    ]
     sensitivity = torch.stack([r[0] for r in res])
     thresholds = torch.stack([r[1] for r in res])
     return sensitivity, thresholds
@@ -302,18 +335,15 @@ def _multilabel_sensitivity_at_specificity_compute(
     ignore_index: Optional[int],
     min_specificity: float,
 ) -> tuple[Tensor, Tensor]:
+    if isinstance(state, Tensor) and thresholds is not None:
+        # all labels share the same thresholds, such that the search can be done for all of them at once
+        return _binned_sensitivity_at_specificity(state, thresholds, min_specificity)
     fpr, sensitivity, thresholds = _multilabel_roc_compute(state, num_labels, thresholds, ignore_index)
     specificity = [_convert_fpr_to_specificity(fpr_) for fpr_ in fpr]
-    if isinstance(state, Tensor):
-        res = [
-            _sensitivity_at_specificity(sp, sn, thresholds, min_specificity)  # type: ignore
-            for sp, sn in zip(sensitivity, specificity)
-        ]
-    else:
-        res = [
-            _sensitivity_at_specificity(sp, sn, t, min_specificity)
-            for sp, sn, t in zip(sensitivity, specificity, thresholds)
-        ]
+    res = [
+        _sensitivity_at_specificity(sp, sn, t, min_specificity)
+        for sp, sn, t in zip(sensitivity, specificity, thresholds)
+    ]
     sensitivity = torch.stack([r[0] for r in res])
     thresholds = torch.stack([r[1] for r in res])
     return sensitivity, thresholds
@@ -120,6 +120,23 @@ def _binary_stat_scores_format(
     return preds, target
 
 
+def _stat_scores_from_masks(preds: Tensor, target: Tensor, sum_dim: list[int]) -> tuple[Tensor, Tensor, Tensor, Tensor]:
+    """Compute the statistics for label formatted binary/multilabel input.
+
+    Only the positive/negative target masks and their overlap with the correct predictions are reduced, ``fn`` and
+    ``fp`` are derived from those counts instead of building two additional masks over the full input.
+
+    """
+    correct = target == preds
+    pos = target == 1
+    neg = target == 0
+    tp = (correct & pos).sum(sum_dim)
+    tn = (correct & neg).sum(sum_dim)
+    fn = pos.sum(sum_dim) - tp
+    fp = neg.sum(sum_dim) - tn
+    return tp.squeeze(), fp.squeeze(), tn.squeeze(), fn.squeeze()
+
+
 def _binary_stat_scores_update(
     preds: Tensor,
     target: Tensor,
@@ -127,11 +144,7 @@ def _binary_stat_scores_update(
 ) -> tuple[Tensor, Tensor, Tensor, Tensor]:
     """Compute the statistics."""
     sum_dim = [0, 1] if multidim_average == "global" else [1]
-    tp = ((target == preds) & (target == 1)).sum(sum_dim).squeeze()
-    fn = ((target != preds) & (target == 1)).sum(sum_dim).squeeze()
-    fp = ((target != preds) & (target == 0)).sum(sum_dim).squeeze()
-    tn = ((target == preds) & (target == 0)).sum(sum_dim).squeeze()
-    return tp, fp, tn, fn
+    return _stat_scores_from_masks(preds, target, sum_dim)
 
 
 def _binary_stat_scores_compute(
@@ -709,11 +722,7 @@ def _multilabel_stat_scores_update(
 ) -> tuple[Tensor, Tensor, Tensor, Tensor]:
     """Compute the statistics."""
     sum_dim = [0, -1] if multidim_average == "global" else [-1]
-    tp = ((target == preds) & (target == 1)).sum(sum_dim).squeeze()
-    fn = ((target != preds) & (target == 1)).sum(sum_dim).squeeze()
-    fp = ((target != preds) & (target == 0)).sum(sum_dim).squeeze()
-    tn = ((target == preds) & (target == 0)).sum(sum_dim).squeeze()
-    return tp, fp, tn, fn
+    return _stat_scores_from_masks(preds, target, sum_dim)
 
 
 def _multilabel_stat_scores_compute(
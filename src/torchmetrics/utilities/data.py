@@ -36,6 +36,24 @@ def dim_zero_cat(x: Union[Tensor, List[Tensor]]) -> Tensor:
     return torch.cat(x, dim=0)
 
 
+def _dim_zero_cat_state(obj: Any, attr: str) -> Tensor:
+    """Concatenate the list state ``attr`` of ``obj`` along the zero dimension and compact it in place.
+
+    The state is replaced by a list holding only the concatenated tensor, such that repeated calls without new updates
+    in between (e.g. ``compute`` with ``compute_with_cache=False``) do not concatenate the same batches again. New
+    updates simply append to the compacted list. States that are already tensors are returned as is.
+
+    """
+    state = getattr(obj, attr)
+    if isinstance(state, Tensor):
+        return state
+    if len(state) == 1 and state[0].ndim > 0:
+        return state[0]
+    state = dim_zero_cat(state)
+    setattr(obj, attr, [state])
+    return state
+
+
 def dim_zero_sum(x: Tensor) -> Tensor:
     """Summation along the zero dimension."""
     return torch.sum(x, dim=0)
@@ -97,6 +97,27 @@ def _simple_gather_all_tensors(result: Tensor, group: Any, world_size: int) -> L
     return gathered_result
 
 
+def _all_reduce_sum(result: Tensor, group: Optional[Any] = None) -> Tensor:
+    """Sum a tensor over all processes with a single all-reduce.
+
+    The reduction is done on a copy, such that the input tensor (which may be cached as the local state of a metric)
+    is left untouched.
+
+    Args:
+        result: the value to sync
+        group: the process group to reduce over. Defaults to all processes (world)
+
+    Return:
+        tensor with the elementwise sum of ``result`` over all processes in the group
+
+    """
+    if group is None:
+        group = torch.distributed.group.WORLD
+    reduced = result.detach().clone().contiguous()
+    torch.distributed.all_reduce(reduced, op=torch.distributed.ReduceOp.SUM, group=group)
+    return reduced
+
+
 def gather_all_tensors(result: Tensor, group: Optional[Any] = None) -> List[Tensor]:
     """Gather all tensors from several ddp processes onto a list that is broadcast to all processes.
 
@@ -121,6 +121,15 @@ class ClassificationTask(EnumStr):
     MULTILABEL = "multilabel"
 
 
+# canonical task strings are interned at import time, other spellings fall back to the regular parsing
+_CLASSIFICATION_TASK_LOOKUP: dict[str, ClassificationTask] = {task.value: task for task in ClassificationTask}
+
+
+def _classification_task_from_str(task: str) -> ClassificationTask:
+    """Parse a ``task`` argument with a dict lookup for the canonical task strings."""
+    return _CLASSIFICATION_TASK_LOOKUP.get(task) or ClassificationTask.from_str(task)
+
+
 class ClassificationTaskNoBinary(EnumStr):
     """Enum to represent the different tasks in classification metrics.
 
@@ -97,12 +97,14 @@ def plot_single_or_multi_val(
     ax.get_xaxis().set_visible(False)
 
     if isinstance(val, Tensor):
+        # move to host once, instead of once per plotted value
+        val = val.detach().cpu()
         if val.numel() == 1:
-            ax.plot([val.detach().cpu()], marker="o", markersize=10)
+            ax.plot([val], marker="o", markersize=10)
         else:
             for i, v in enumerate(val):
                 label = f"{legend_name} {i}" if legend_name else f"{i}"
-                ax.plot(i, v.detach().cpu(), marker="o", markersize=10, linestyle="None", label=label)
+                ax.plot(i, v, marker="o", markersize=10, linestyle="None", label=label)
     elif isinstance(val, dict):
         for i, (k, v) in enumerate(val.items()):
             if v.numel() != 1:
@@ -119,12 +121,13 @@ def plot_single_or_multi_val(
             for k, v in val.items():
                 ax.plot(v.detach().cpu(), marker="o", markersize=10, linestyle="-", label=k)
         else:
-            val = torch.stack(val, 0)  # type: ignore
+            # stack on device and move to host once, instead of once per plotted series
+            val = torch.stack(val, 0).detach().cpu()  # type: ignore
             multi_series = val.ndim != 1
             val = val.T if multi_series else val.unsqueeze(0)
             for i, v in enumerate(val):
                 label = (f"{legend_name} {i}" if legend_name else f"{i}") if multi_series else ""
-                ax.plot(v.detach().cpu(), marker="o", markersize=10, linestyle="-", label=label)
+                ax.plot(v, marker="o", markersize=10, linestyle="-", label=label)
         ax.get_xaxis().set_visible(True)
         ax.set_xlabel("Step")
         ax.set_xticks(torch.arange(n_steps))
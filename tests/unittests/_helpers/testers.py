@@ -781,8 +781,9 @@ def remove_ignore_index(target: Tensor, preds: Tensor, ignore_index: Optional[in
 
     """
     if ignore_index is not None:
-        idx = target == ignore_index
-        target, preds = deepcopy(target[~idx]), deepcopy(preds[~idx])
+        # boolean indexing already returns copies, for both tensors and numpy arrays
+        idx = target != ignore_index
+        target, preds = target[idx], preds[idx]
     return target, preds
 
 
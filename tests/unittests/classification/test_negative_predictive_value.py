@@ -25,6 +25,7 @@ from torchmetrics.classification.negative_predictive_value import (
     MulticlassNegativePredictiveValue,
     MultilabelNegativePredictiveValue,
     NegativePredictiveValue,
+    _disable_compile,
 )
 from torchmetrics.functional.classification.negative_predictive_value import (
     binary_negative_predictive_value,
@@ -36,7 +37,14 @@ from torchmetrics.utilities.imports import _TORCH_GREATER_EQUAL_2_1
 from unittests import NUM_CLASSES, THRESHOLD
 from unittests._helpers import seed_all
 from unittests._helpers.testers import MetricTester, inject_ignore_index
-from unittests.classification._inputs import _binary_cases, _multiclass_cases, _multilabel_cases
+from unittests.classification._inputs import (
+    _binary_cases,
+    _input_binary_prob,
+    _input_multiclass,
+    _input_multilabel_prob,
+    _multiclass_cases,
+    _multilabel_cases,
+)
 
 seed_all(42)
 
@@ -580,6 +588,76 @@ def test_corner_cases():
     assert res == 1.0
 
 
+def test_multidim_average_none_is_global():
+    """Test that the task wrapper treats ``multidim_average=None`` as ``"global"``."""
+    metric = NegativePredictiveValue(task="multiclass", num_classes=3, multidim_average=None)
+    assert isinstance(metric, MulticlassNegativePredictiveValue)
+    assert metric.multidim_average == "global"
+
+
+def test_samplewise_state_compacted_on_compute():
+    """Test that list states are only concatenated once when computing repeatedly without new updates."""
+    metric = MulticlassNegativePredictiveValue(
+        num_classes=NUM_CLASSES, multidim_average="samplewise", compute_with_cache=False
+    )
+    for _ in range(3):
+        metric.update(torch.randint(NUM_CLASSES, (4, 10)), torch.randint(NUM_CLASSES, (4, 10)))
+    assert len(metric.tn) == 3
+    res = metric.compute()
+    assert len(metric.tn) == 1
+    assert metric.tn[0].dtype == torch.int32
+    assert torch.allclose(res, metric.compute())
+
+
+@pytest.mark.skipif(not _TORCH_GREATER_EQUAL_2_1, reason="test requires torch>=2.1")
+@pytest.mark.parametrize(
+    ("metric", "kwargs", "inputs"),
+    [
+        (BinaryNegativePredictiveValue, {}, _input_binary_prob),
+        (MulticlassNegativePredictiveValue, {"num_classes": NUM_CLASSES, "average": "weighted"}, _input_multiclass),
+        (MultilabelNegativePredictiveValue, {"num_labels": NUM_CLASSES, "average": "none"}, _input_multilabel_prob),
+    ],
+)
+def test_compile_reduce(metric, kwargs, inputs):
+    """Test that compiling the reduction gives the same result as the eager reduction."""
+    preds, target = inputs
+    eager_metric = metric(**kwargs)
+    compiled_metric = metric(compile_reduce=True, **kwargs)
+    for i in range(preds.shape[0]):
+        eager_metric.update(preds[i], target[i])
+        compiled_metric.update(preds[i], target[i])
+    assert torch.allclose(eager_metric.compute(), compiled_metric.compute())
+
+
+@pytest.mark.skipif(not _TORCH_GREATER_EQUAL_2_1, reason="test requires torch>=2.1")
+def test_disable_compile():
+    """Test that a method excluded from compilation runs eagerly and correctly inside a compiled function."""
+
+    class _Plotter:
+        def __init__(self) -> None:
+            self.values = []
+
+        @_disable_compile
+        def plot(self, val: Tensor) -> Tensor:
+            """Record the value as python floats, which would break the graph if it was traced."""
+            self.values.append(val.tolist())
+            return val.sum()
+
+    plotter = _Plotter()
+    assert _Plotter.plot.__name__ == "plot"
+    assert _Plotter.plot.__doc__.startswith("Record the value")
+
+    def step(x: Tensor) -> Tensor:
+        return plotter.plot(x * 2) + 1
+
+    compiled_step = torch.compile(step, backend="eager")
+    for _ in range(2):
+        x = torch.rand(4)
+        assert torch.allclose(compiled_step(x), step(x))
+        assert plotter.values[-2] == plotter.values[-1] == (x * 2).tolist()
+    assert len(plotter.values) == 4
+
+
 @pytest.mark.parametrize(
     ("metric", "kwargs"),
     [
@@ -28,6 +28,13 @@ from torchmetrics.classification.precision_recall_curve import (
     PrecisionRecallCurve,
 )
 from torchmetrics.functional.classification.precision_recall_curve import (
+    _binary_precision_recall_curve_update,
+    _binary_precision_recall_curve_update_vectorized,
+    _multiclass_precision_recall_curve_update,
+    _multiclass_precision_recall_curve_update_vectorized,
+    _multilabel_precision_recall_curve_format,
+    _multilabel_precision_recall_curve_update,
+    _precision_recall_curve_update_searchsorted,
     binary_precision_recall_curve,
     multiclass_precision_recall_curve,
     multilabel_precision_recall_curve,
@@ -489,3 +496,57 @@ def test_precision_nan_when_no_preds_meet_threshold(thresholds):
     assert torch.isnan(precision_bins[mask]).all(), f"Precision not NaN for thresholds {thres[mask]}"
 
     assert torch.all(recall_bins[mask] == 0.0), f"Recall not zero for thresholds {thres[mask]}"
+
+
+@pytest.mark.parametrize("thresholds", [torch.linspace(0, 1, 10), torch.tensor([0.9, 0.1, 0.5, 0.3])])
+def test_update_searchsorted_matches_vectorized(thresholds):
+    """Test that binning the predictions with searchsorted gives the same confusion matrix as the vectorized update."""
+    preds, target = torch.rand(100), torch.randint(2, (100,))
+    expected = _binary_precision_recall_curve_update_vectorized(preds, target, thresholds)
+    assert torch.equal(_precision_recall_curve_update_searchsorted(preds, target, thresholds), expected)
+
+    preds, target = torch.rand(100, NUM_CLASSES).softmax(-1), torch.randint(NUM_CLASSES, (100,))
+    expected = _multiclass_precision_recall_curve_update_vectorized(preds, target, NUM_CLASSES, thresholds)
+    one_hot_target = torch.nn.functional.one_hot(target, num_classes=NUM_CLASSES)
+    assert torch.equal(_precision_recall_curve_update_searchsorted(preds, one_hot_target, thresholds), expected)
+
+    preds, target = torch.rand(100, NUM_CLASSES), inject_ignore_index(torch.randint(2, (100, NUM_CLASSES)), -1)
+    preds, target, _ = _multilabel_precision_recall_curve_format(preds, target, NUM_CLASSES, thresholds, -1)
+    expected = _multilabel_precision_recall_curve_update(preds, target, NUM_CLASSES, thresholds)
+    assert torch.equal(_precision_recall_curve_update_searchsorted(preds, target, thresholds), expected)
+
+
+@pytest.mark.parametrize("deterministic", [False, True])
+def test_large_input_update_matches_vectorized(deterministic):
+    """Test that the updates of inputs large enough to be binned with searchsorted match the vectorized updates."""
+    thresholds = torch.linspace(0, 1, 10)
+    binary_preds, binary_target = torch.rand(60_000), torch.randint(2, (60_000,))
+    multiclass_preds = torch.rand(50_000, NUM_CLASSES).softmax(-1)
+    multiclass_target = torch.randint(NUM_CLASSES, (50_000,))
+    multilabel_preds, multilabel_target = torch.rand(50_000, NUM_CLASSES), torch.randint(2, (50_000, NUM_CLASSES))
+
+    binary_expected = _binary_precision_recall_curve_update_vectorized(binary_preds, binary_target, thresholds)
+    multiclass_expected = _multiclass_precision_recall_curve_update_vectorized(
+        multiclass_preds, multiclass_target, NUM_CLASSES, thresholds
+    )
+    # chunks of 10k samples are small enough for the vectorized multilabel update
+    multilabel_expected = sum(
+        _multilabel_precision_recall_curve_update(p, t, NUM_CLASSES, thresholds)
+        for p, t in zip(multilabel_preds.split(10_000), multilabel_target.split(10_000))
+    )
+
+    deterministic_before = torch.are_deterministic_algorithms_enabled()
+    torch.use_deterministic_algorithms(deterministic)
+    try:
+        binary_res = _binary_precision_recall_curve_update(binary_preds, binary_target, thresholds)
+        multiclass_res = _multiclass_precision_recall_curve_update(
+            multiclass_preds, multiclass_target, NUM_CLASSES, thresholds
+        )
+        multilabel_res = _multilabel_precision_recall_curve_update(
+            multilabel_preds, multilabel_target, NUM_CLASSES, thresholds
+        )
+    finally:
+        torch.use_deterministic_algorithms(deterministic_before)
+    assert torch.equal(binary_res, binary_expected)
+    assert torch.equal(multiclass_res, multiclass_expected)
+    assert torch.equal(multilabel_res, multilabel_expected)
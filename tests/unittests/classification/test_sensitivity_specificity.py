@@ -13,22 +13,23 @@
 # limitations under the License.
 
 from functools import partial
+from unittest import mock
 
 import numpy as np
 import pytest
 import torch
-from scipy.special import expit as sigmoid
-from scipy.special import softmax
-from sklearn.metrics import roc_curve as sk_roc_curve
 
 from torchmetrics.classification.sensitivity_specificity import (
     BinarySensitivityAtSpecificity,
     MulticlassSensitivityAtSpecificity,
     MultilabelSensitivityAtSpecificity,
     SensitivityAtSpecificity,
+    _to_state_device,
 )
+from torchmetrics.functional.classification.roc import binary_roc, multiclass_roc, multilabel_roc
 from torchmetrics.functional.classification.sensitivity_specificity import (
     _convert_fpr_to_specificity,
+    _sensitivity_at_specificity,
     binary_sensitivity_at_specificity,
     multiclass_sensitivity_at_specificity,
     multilabel_sensitivity_at_specificity,
@@ -38,12 +39,33 @@ from torchmetrics.utilities.imports import _TORCH_GREATER_EQUAL_2_1
 from unittests import NUM_CLASSES
 from unittests._helpers import _SKLEARN_GREATER_EQUAL_1_3, seed_all
 from unittests._helpers.testers import MetricTester, inject_ignore_index, remove_ignore_index
-from unittests.classification._inputs import _binary_cases, _multiclass_cases, _multilabel_cases
+from unittests.classification._inputs import (
+    _binary_cases,
+    _input_binary_prob,
+    _input_multiclass_prob,
+    _input_multilabel_prob,
+    _multiclass_cases,
+    _multilabel_cases,
+)
 
 seed_all(42)
 
+# thresholds shared by the threshold_arg tests, built once instead of for every batch
+_THRESH_100 = torch.linspace(0, 1, 100)
+
+
+def _in_unit_interval(x):
+    """Check if all values are probabilities in ``(0, 1)`` with min/max reductions instead of two boolean masks.
+
+    Logits are usually detected by the first reduction already, such that the second one is skipped.
+
+    """
+    return bool(x.min() > 0) and bool(x.max() < 1)
+
 
 def _sensitivity_at_specificity_x_multilabel(predictions, targets, min_specificity):
+    from sklearn.metrics import roc_curve as sk_roc_curve
+
     # get fpr, tpr and thresholds
     fpr, sensitivity, thresholds = sk_roc_curve(targets, predictions, pos_label=1.0, drop_intermediate=False)
     sensitivity[np.isnan(sensitivity)] = 0.0
@@ -55,29 +77,27 @@ def _sensitivity_at_specificity_x_multilabel(predictions, targets, min_specifici
 
     # convert fpr to sensitivity (sensitivity = 1 - fpr)
     specificity = _convert_fpr_to_specificity(fpr)
+    return _select_sensitivity_at_specificity(sensitivity, specificity, thresholds, min_specificity)
 
-    # get indices where specificity is greater than min_specificity
-    indices = specificity >= min_specificity
-
-    # if no indices are found, max_spec, best_threshold = 0.0, 1e6
-    if not indices.any():
-        max_spec, best_threshold = 0.0, 1e6
-    else:
-        # redefine sensitivity, specificity and threshold tensor based on indices
-        sensitivity, specificity, thresholds = sensitivity[indices], specificity[indices], thresholds[indices]
 
-        # get argmax
-        idx = np.argmax(sensitivity)
+def _select_sensitivity_at_specificity(sensitivity, specificity, thresholds, min_specificity):
+    # the false positives only accumulate along the curve, such that the specificity never increases and the points
+    # where it is at least min_specificity are a prefix of the curve
+    k = np.searchsorted(-specificity, -min_specificity, side="right")
 
-        # get max_spec and best_threshold
-        max_spec, best_threshold = sensitivity[idx], thresholds[idx]
-    return float(max_spec), float(best_threshold)
+    # if no indices are found, max_spec, best_threshold = 0.0, 1e6
+    if k == 0:
+        return 0.0, 1e6
+    idx = np.argmax(sensitivity[:k])
+    return float(sensitivity[idx]), float(thresholds[idx])
 
 
 def _reference_sklearn_sensitivity_at_specificity_binary(preds, target, min_specificity, ignore_index=None):
-    preds = preds.flatten().numpy()
-    target = target.flatten().numpy()
-    if np.issubdtype(preds.dtype, np.floating) and not ((preds > 0) & (preds < 1)).all():
+    from scipy.special import expit as sigmoid
+
+    preds = preds.reshape(-1).numpy()
+    target = target.reshape(-1).numpy()
+    if np.issubdtype(preds.dtype, np.floating) and not _in_unit_interval(preds):
         preds = sigmoid(preds)
     target, preds = remove_ignore_index(target=target, preds=preds, ignore_index=ignore_index)
     return _sensitivity_at_specificity_x_multilabel(preds, target, min_specificity)
@@ -184,18 +204,21 @@ class TestBinarySensitivityAtSpecificity(MetricTester):
         preds, target = inputs
 
         for pred, true in zip(preds, target):
-            pred = torch.tensor(np.round(pred.numpy(), 1)) + 1e-6  # rounding will simulate binning
+            pred = (pred.detach() * 10).round() / 10 + 1e-6  # rounding will simulate binning
             r1, _ = binary_sensitivity_at_specificity(pred, true, min_specificity=min_specificity, thresholds=None)
             r2, _ = binary_sensitivity_at_specificity(
-                pred, true, min_specificity=min_specificity, thresholds=torch.linspace(0, 1, 100)
+                pred, true, min_specificity=min_specificity, thresholds=_THRESH_100
             )
             assert torch.allclose(r1, r2)
 
 
 def _reference_sklearn_sensitivity_at_specificity_multiclass(preds, target, min_specificity, ignore_index=None):
-    preds = np.moveaxis(preds.numpy(), 1, -1).reshape((-1, preds.shape[1]))
-    target = target.numpy().flatten()
-    if not ((preds > 0) & (preds < 1)).all():
+    from scipy.special import softmax
+
+    # move the classes last in torch, which copies into the contiguous (N, C) layout in a single pass
+    preds = preds.movedim(1, -1).contiguous().view(-1, preds.shape[1]).numpy()
+    target = target.reshape(-1).numpy()
+    if not _in_unit_interval(preds):
         preds = softmax(preds, 1)
     target, preds = remove_ignore_index(target=target, preds=preds, ignore_index=ignore_index)
 
@@ -283,7 +306,7 @@ class TestMulticlassSensitivityAtSpecificity(MetricTester):
     def test_multiclass_sensitivity_at_specificity_dtype_cpu(self, inputs, dtype):
         """Test dtype support of the metric on CPU."""
         preds, target = inputs
-        if dtype == torch.half and not ((preds > 0) & (preds < 1)).all():
+        if dtype == torch.half and not _in_unit_interval(preds):
             pytest.xfail(reason="half support for torch.softmax on cpu not implemented")
         self.run_precision_test_cpu(
             preds=preds,
@@ -315,7 +338,7 @@ class TestMulticlassSensitivityAtSpecificity(MetricTester):
         if (preds < 0).any():
             preds = preds.softmax(dim=-1)
         for pred, true in zip(preds, target):
-            pred = torch.tensor(np.round(pred.detach().numpy(), 1)) + 1e-6  # rounding will simulate binning
+            pred = (pred.detach() * 10).round() / 10 + 1e-6  # rounding will simulate binning
             r1, _ = multiclass_sensitivity_at_specificity(
                 pred, true, num_classes=NUM_CLASSES, min_specificity=min_specificity, thresholds=None
             )
@@ -324,9 +347,9 @@ class TestMulticlassSensitivityAtSpecificity(MetricTester):
                 true,
                 num_classes=NUM_CLASSES,
                 min_specificity=min_specificity,
-                thresholds=torch.linspace(0, 1, 100),
+                thresholds=_THRESH_100,
             )
-            assert all(torch.allclose(r1[i], r2[i]) for i in range(len(r1)))
+            assert torch.allclose(r1, r2)
 
 
 def _reference_sklearn_sensitivity_at_specificity_multilabel(preds, target, min_specificity, ignore_index=None):
@@ -414,7 +437,7 @@ class TestMultilabelSensitivityAtSpecificity(MetricTester):
     def test_multilabel_sensitivity_at_specificity_dtype_cpu(self, inputs, dtype):
         """Test dtype support of the metric on CPU."""
         preds, target = inputs
-        if dtype == torch.half and not ((preds > 0) & (preds < 1)).all():
+        if dtype == torch.half and not _in_unit_interval(preds):
             pytest.xfail(reason="half support for torch.softmax on cpu not implemented")
         self.run_precision_test_cpu(
             preds=preds,
@@ -444,9 +467,9 @@ class TestMultilabelSensitivityAtSpecificity(MetricTester):
         """Test that different types of `thresholds` argument lead to same result."""
         preds, target = inputs
         if (preds < 0).any():
-            preds = sigmoid(preds)
+            preds = preds.sigmoid()
         for pred, true in zip(preds, target):
-            pred = torch.tensor(np.round(pred.detach().numpy(), 1)) + 1e-6  # rounding will simulate binning
+            pred = (pred.detach() * 10).round() / 10 + 1e-6  # rounding will simulate binning
             r1, _ = multilabel_sensitivity_at_specificity(
                 pred, true, num_labels=NUM_CLASSES, min_specificity=min_specificity, thresholds=None
             )
@@ -455,9 +478,9 @@ class TestMultilabelSensitivityAtSpecificity(MetricTester):
                 true,
                 num_labels=NUM_CLASSES,
                 min_specificity=min_specificity,
-                thresholds=torch.linspace(0, 1, 100),
+                thresholds=_THRESH_100,
             )
-            assert all(torch.allclose(r1[i], r2[i]) for i in range(len(r1)))
+            assert torch.allclose(r1, r2)
 
 
 @pytest.mark.parametrize(
@@ -475,6 +498,208 @@ def test_valid_input_thresholds(recwarn, metric, thresholds):
     assert len(recwarn) == 0, "Warning was raised when it should not have been."
 
 
+@pytest.mark.parametrize("thresholds", [10, [0.9, 0.1, 0.5, 0.3]])
+@pytest.mark.parametrize("ignore_index", [None, -1])
+@pytest.mark.parametrize(
+    ("metric", "functional", "kwargs", "inputs"),
+    [
+        (BinarySensitivityAtSpecificity, binary_sensitivity_at_specificity, {}, _input_binary_prob),
+        (
+            MulticlassSensitivityAtSpecificity,
+            multiclass_sensitivity_at_specificity,
+            {"num_classes": NUM_CLASSES},
+            _input_multiclass_prob,
+        ),
+        (
+            MultilabelSensitivityAtSpecificity,
+            multilabel_sensitivity_at_specificity,
+            {"num_labels": NUM_CLASSES},
+            _input_multilabel_prob,
+        ),
+    ],
+)
+def test_binned_update_matches_functional(metric, functional, kwargs, inputs, thresholds, ignore_index):
+    """Test that the binned update of the modular metrics gives the same result as the functional metrics."""
+    preds, target = inputs
+    if ignore_index is not None:
+        target = inject_ignore_index(target, ignore_index)
+    m = metric(min_specificity=0.5, thresholds=thresholds, ignore_index=ignore_index, **kwargs)
+    for i in range(preds.shape[0]):
+        m.update(preds[i], target[i])
+    res = m.compute()
+    expected = functional(
+        preds.flatten(0, 1),
+        target.flatten(0, 1),
+        min_specificity=0.5,
+        thresholds=thresholds,
+        ignore_index=ignore_index,
+        **kwargs,
+    )
+    assert all(torch.allclose(r1, r2) for r1, r2 in zip(res, expected))
+
+
+def test_binary_preds_quantization():
+    """Test that quantized predictions give the same result when the predictions lie on the quantization levels."""
+    preds, target = torch.randint(256, (4, 25)) / 255, torch.randint(2, (4, 25))
+    metric = BinarySensitivityAtSpecificity(min_specificity=0.5, preds_quantization_bits=8)
+    reference = BinarySensitivityAtSpecificity(min_specificity=0.5)
+    for i in range(preds.shape[0]):
+        metric.update(preds[i], target[i])
+        reference.update(preds[i], target[i])
+    assert metric.preds[0].dtype == torch.uint8
+    assert all(torch.allclose(r1, r2) for r1, r2 in zip(metric.compute(), reference.compute()))
+
+    for validate_args in (True, False):
+        with pytest.raises(ValueError, match="Expected argument `preds_quantization_bits`.*"):
+            BinarySensitivityAtSpecificity(min_specificity=0.5, preds_quantization_bits=9, validate_args=validate_args)
+
+    # unnormalized logits are clamped instead of wrapping around
+    metric = BinarySensitivityAtSpecificity(min_specificity=0.5, preds_quantization_bits=8, normalization=None)
+    metric.update(torch.tensor([-3.0, 0.25, 2.0]), torch.tensor([0, 0, 1]))
+    assert metric.preds[0].tolist() == [0, 64, 255]
+
+
+def test_list_states_compacted_on_compute():
+    """Test that the stored batches are concatenated once and reused by repeated calls to compute."""
+    metric = BinarySensitivityAtSpecificity(min_specificity=0.5, compute_with_cache=False)
+    for _ in range(3):
+        metric.update(torch.rand(10), torch.randint(2, (10,)))
+    assert len(metric.preds) == 3
+    res = metric.compute()
+    assert len(metric.preds) == 1
+    assert len(metric.target) == 1
+    assert all(torch.allclose(r1, r2) for r1, r2 in zip(res, metric.compute()))
+
+    # batches added after a compute are appended behind the already concatenated ones
+    reference = BinarySensitivityAtSpecificity(min_specificity=0.5)
+    reference.update(metric.preds[0].clone(), metric.target[0].clone())
+    for _ in range(2):
+        preds, target = torch.rand(10), torch.randint(2, (10,))
+        metric.update(preds, target)
+        reference.update(preds, target)
+        res = metric.compute()
+        assert len(metric.preds) == 1
+        assert all(torch.allclose(r1, r2) for r1, r2 in zip(res, reference.compute()))
+
+
+@pytest.mark.parametrize(
+    ("functional", "roc", "kwargs", "preds", "target"),
+    [
+        (binary_sensitivity_at_specificity, binary_roc, {}, torch.rand(50), torch.randint(2, (50,))),
+        (
+            multiclass_sensitivity_at_specificity,
+            multiclass_roc,
+            {"num_classes": NUM_CLASSES},
+            torch.rand(50, NUM_CLASSES).softmax(-1),
+            torch.randint(NUM_CLASSES, (50,)),
+        ),
+        (
+            multilabel_sensitivity_at_specificity,
+            multilabel_roc,
+            {"num_labels": NUM_CLASSES},
+            torch.rand(50, NUM_CLASSES),
+            torch.randint(2, (50, NUM_CLASSES)),
+        ),
+    ],
+)
+def test_binned_zero_min_specificity(functional, roc, kwargs, preds, target):
+    """Test that the shortcut for ``min_specificity=0`` matches the search over the full curve."""
+    fpr, tpr, thresholds = roc(preds, target, thresholds=10, **kwargs)
+    expected = _sensitivity_at_specificity(tpr, _convert_fpr_to_specificity(fpr), thresholds, 0.0)
+    res = functional(preds, target, min_specificity=0.0, thresholds=10, **kwargs)
+    assert all(torch.allclose(r1, r2) for r1, r2 in zip(res, expected))
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="test requires cuda")
+def test_binned_update_cpu_inputs_cuda_state():
+    """Test that CPU inputs are moved to the device of the binned state."""
+    metric = BinarySensitivityAtSpecificity(min_specificity=0.5, thresholds=10).cuda()
+    preds, target = torch.rand(50), torch.randint(2, (50,))
+    metric.update(preds, target)
+    assert metric.confmat.is_cuda
+    expected = binary_sensitivity_at_specificity(preds, target, min_specificity=0.5, thresholds=10)
+    assert all(torch.allclose(r1.cpu(), r2) for r1, r2 in zip(metric.compute(), expected))
+
+
+def test_cpu_inputs_staged_for_cuda_state():
+    """Test that CPU inputs are only copied through pinned memory to CUDA states, without requiring a CUDA device."""
+    x = torch.rand(10)
+    pinned = mock.MagicMock()
+    with mock.patch.object(torch.Tensor, "pin_memory", return_value=pinned) as pin_memory:
+        res = _to_state_device(x, torch.device("cuda"))
+    pin_memory.assert_called_once_with()
+    pinned.to.assert_called_once_with(torch.device("cuda"), non_blocking=True)
+    assert res is pinned.to.return_value
+    assert _to_state_device(x, torch.device("cpu")) is x
+
+    # only the binned update moves the inputs to the device of the state
+    preds, target = torch.rand(10), torch.randint(2, (10,))
+    for thresholds, num_calls in [(10, 2), (None, 0)]:
+        metric = BinarySensitivityAtSpecificity(min_specificity=0.5, thresholds=thresholds)
+        with mock.patch(
+            "torchmetrics.classification.sensitivity_specificity._to_state_device", side_effect=_to_state_device
+        ) as to_state_device:
+            metric.update(preds, target)
+        assert to_state_device.call_count == num_calls
+        if num_calls:
+            to_state_device.assert_called_with(target, metric.confmat.device)
+
+
+@pytest.mark.parametrize(("thresholds", "steps"), [("log", 100), (("log", 20), 20)])
+def test_binary_log_thresholds(thresholds, steps):
+    """Test that the logarithmic thresholds are sorted, dense close to 1 and used as bins."""
+    metric = BinarySensitivityAtSpecificity(min_specificity=0.9, thresholds=thresholds)
+    assert metric.thresholds.shape == (steps,)
+    assert bool((metric.thresholds[1:] > metric.thresholds[:-1]).all())
+    assert metric.thresholds[0] == 0
+    assert metric.thresholds[-1] > 0.999
+
+    preds, target = torch.rand(100), torch.randint(2, (100,))
+    metric.update(preds, target)
+    expected = binary_sensitivity_at_specificity(preds, target, min_specificity=0.9, thresholds=metric.thresholds)
+    assert all(torch.allclose(r1, r2) for r1, r2 in zip(metric.compute(), expected))
+
+
+@pytest.mark.parametrize("thresholds", ["linear", ("log", 1), ("log", 0.5)])
+def test_binary_log_thresholds_raises(thresholds):
+    """Test that invalid string or tuple thresholds raise an error."""
+    with pytest.raises(ValueError, match="Expected argument `thresholds` given as a string or tuple.*"):
+        BinarySensitivityAtSpecificity(min_specificity=0.9, thresholds=thresholds)
+
+
+@pytest.mark.parametrize("thresholds", [None, 10])
+def test_dlpack_input(thresholds):
+    """Test that inputs implementing the DLPack protocol give the same result as tensors."""
+    preds, target = np.random.rand(20).astype(np.float32), np.random.randint(2, size=20)
+    metric = BinarySensitivityAtSpecificity(min_specificity=0.5, thresholds=thresholds)
+    metric.update(preds, target)
+    expected = binary_sensitivity_at_specificity(
+        torch.from_numpy(preds), torch.from_numpy(target), min_specificity=0.5, thresholds=thresholds
+    )
+    assert all(torch.allclose(r1, r2) for r1, r2 in zip(metric.compute(), expected))
+
+
+@pytest.mark.skipif(not _TORCH_GREATER_EQUAL_2_1, reason="test requires torch>=2.1")
+@pytest.mark.parametrize("thresholds", [None, 10])
+@pytest.mark.parametrize(
+    ("metric", "kwargs", "inputs"),
+    [
+        (BinarySensitivityAtSpecificity, {}, _input_binary_prob),
+        (MulticlassSensitivityAtSpecificity, {"num_classes": NUM_CLASSES}, _input_multiclass_prob),
+        (MultilabelSensitivityAtSpecificity, {"num_labels": NUM_CLASSES}, _input_multilabel_prob),
+    ],
+)
+def test_compile_compute(metric, kwargs, inputs, thresholds):
+    """Test that compiling the computation gives the same result as the eager computation."""
+    preds, target = inputs
+    eager_metric = metric(min_specificity=0.5, thresholds=thresholds, **kwargs)
+    compiled_metric = metric(min_specificity=0.5, thresholds=thresholds, compile_compute=True, **kwargs)
+    for i in range(preds.shape[0]):
+        eager_metric.update(preds[i], target[i])
+        compiled_metric.update(preds[i], target[i])
+    assert all(torch.allclose(r1, r2) for r1, r2 in zip(eager_metric.compute(), compiled_metric.compute()))
+
+
 @pytest.mark.parametrize(
     ("metric", "kwargs"),
     [